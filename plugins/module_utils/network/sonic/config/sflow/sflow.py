@@ -13,8 +13,6 @@ created
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
-from copy import deepcopy
-
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
     ConfigBase,
 )
@@ -31,6 +29,7 @@ from ansible_collections.dellemc.enterprise_sonic.plugins.module_utils.network.s
         to_request,
         edit_config,
         get_normalize_interface_name,
+        normalize_interface_name,
         get_replaced_config
     )
 
@@ -54,6 +53,14 @@ class Sflow(ConfigBase):
     sflow_diff_test_keys = [{"collectors": {"port": "", "address": "", "network_instance": ""}},
                             {"interfaces": {"name": ""}}]
 
+    # (argspec name, REST name) pairs for settings that are copied straight into request bodies
+    config_rest_fields = (("enabled", "enabled"),
+                          ("polling_interval", "polling-interval"),
+                          ("agent", "agent"),
+                          ("sampling_rate", "sampling-rate"))
+    interface_rest_fields = (("enabled", "enabled"),
+                             ("sampling_rate", "sampling-rate"))
+
     def __init__(self, module):
         super(Sflow, self).__init__(module)
 
@@ -88,11 +95,11 @@ class Sflow(ConfigBase):
                     self._module.fail_json(msg=str(exc), code=exc.errno)
             result['changed'] = True
         result['commands'] = commands
-        changed_sflow_facts = self.get_sflow_facts()
 
         result['before'] = existing_sflow_facts
         if result['changed']:
-            result['after'] = changed_sflow_facts
+            # only read the configuration back when something could have changed
+            result['after'] = self.get_sflow_facts()
 
         result['warnings'] = warnings
         return result
@@ -170,6 +177,10 @@ class Sflow(ConfigBase):
         requests = []
 
         self.fill_defaults(want)
+        if want == have:
+            # already matches, both diffs would come back empty
+            return commands, requests
+
         remove_diff = get_diff(have, want, test_keys=self.sflow_diff_test_keys)
         introduced_diff = get_diff(want, have, test_keys=self.sflow_diff_test_keys)
 
@@ -200,7 +211,7 @@ class Sflow(ConfigBase):
                   the current configuration, and a list of requests needed to make changes
         """
 
-        if not want:
+        if not want or want == have:
             # nothing to do here
             return [], []
 
@@ -234,15 +245,10 @@ class Sflow(ConfigBase):
             # default value is false so only need to do the "delete" (actually reset) if values are true and match
             commands.update({"enabled": have["enabled"]})
 
-        if "polling_interval" in want and "polling_interval" in have and want["polling_interval"] == have["polling_interval"]:
+        for setting in ("polling_interval", "agent", "sampling_rate"):
             # want to make sure setting specified and match
-            commands.update({"polling_interval": have["polling_interval"]})
-
-        if "agent" in want and "agent" in have and want["agent"] == have["agent"]:
-            commands.update({"agent": have["agent"]})
-
-        if "sampling_rate" in want and "sampling_rate" in have and want["sampling_rate"] == have["sampling_rate"]:
-            commands.update({"sampling_rate": have["sampling_rate"]})
+            if setting in want and setting in have and want[setting] == have[setting]:
+                commands[setting] = have[setting]
 
         if ("collectors" in want or len(want) == 0) and "collectors" in have:
             # either clear all settings, all collectors or certain collectors here
@@ -253,12 +259,12 @@ class Sflow(ConfigBase):
 
             deleted_list = []
 
-            have_collectors_dict = {(collector["address"], collector["network_instance"], collector["port"]): collector for collector in have["collectors"]}
+            have_collectors_dict = {get_collector_key(collector): collector for collector in have["collectors"]}
 
             for collector in to_delete_list:
-                found_match = (collector["address"], collector["network_instance"], collector["port"]) in have_collectors_dict
-                if found_match:
-                    deleted_list.append(have_collectors_dict[(collector["address"], collector["network_instance"], collector["port"])])
+                matched_collector = have_collectors_dict.get(get_collector_key(collector))
+                if matched_collector is not None:
+                    deleted_list.append(matched_collector)
             if len(deleted_list) > 0:
                 commands.update({"collectors": deleted_list})
 
@@ -274,11 +280,11 @@ class Sflow(ConfigBase):
             have_interfaces_dict = {interface["name"]: interface for interface in have["interfaces"]}
 
             for to_delete_interface in to_delete_list:
-                if to_delete_interface["name"] in have_interfaces_dict:
-                    matched_interface = have_interfaces_dict[to_delete_interface["name"]]
+                matched_interface = have_interfaces_dict.get(to_delete_interface["name"])
+                if matched_interface is not None:
                     if to_delete_interface.keys() == {"name"}:
                         # just name specified means delete what is in have
-                        deleted_list.append(have_interfaces_dict[to_delete_interface["name"]])
+                        deleted_list.append(matched_interface)
                     else:
                         filtered_delete_interface = {}
 
@@ -317,8 +323,7 @@ class Sflow(ConfigBase):
         if config is not None and config.get("agent") is not None:
             config["agent"] = get_normalize_interface_name(config.get("agent", ""), self._module)
         if config is not None and config.get("interfaces") is not None:
-            for interface in config["interfaces"]:
-                interface["name"] = get_normalize_interface_name(interface.get("name", ""), self._module)
+            normalize_interface_name(config["interfaces"], self._module)
         return config
 
     def create_patch_sflow_root_request(self, to_update_config_dict, request_list):
@@ -358,28 +363,18 @@ class Sflow(ConfigBase):
     def create_config_request_body(self, config_dict):
         '''does format transformation and creates and returns dictionary that holds all sflow global settings that were passed in.
         Takes a dictionary in argspect format and returns the matching REST formatted fields for global config'''
-        request_config = {}
-        if "enabled" in config_dict:
-            request_config["enabled"] = config_dict["enabled"]
-        if "polling_interval" in config_dict:
-            request_config["polling-interval"] = config_dict["polling_interval"]
-        if "agent" in config_dict:
-            request_config["agent"] = config_dict["agent"]
-        if "sampling_rate" in config_dict:
-            request_config["sampling-rate"] = config_dict["sampling_rate"]
-        return request_config
+        return {rest_name: config_dict[name] for name, rest_name in self.config_rest_fields if name in config_dict}
 
     def create_collectors_list_request_body(self, config_dict):
         '''does format transformation and creates and returns a list of sflow collectors with the settings passed in.
         Takes a dictionary for all config in argspec format and returns the collectors listed in REST API format'''
         collector_list = []
         for collector in config_dict["collectors"]:
-            collector_request = {"address": collector["address"],
-                                 "network-instance": collector["network_instance"],
-                                 "port": collector["port"]}
-            # since REST needs the collector list item with its settings and a nested config with a copy of those same settings
-            collector_request.update({"config": dict(collector_request)})
-            collector_list.append(collector_request)
+            collector_config = {"address": collector["address"],
+                                "network-instance": collector["network_instance"],
+                                "port": collector["port"]}
+            # since REST needs the collector list item with its settings and a nested config with those same settings
+            collector_list.append(dict(collector_config, config=collector_config))
         return collector_list
 
     def create_interface_list_request_body(self, config_dict):
@@ -387,11 +382,7 @@ class Sflow(ConfigBase):
         Takes a dictionary for all config in argspec format and returns all interfaces listed that have configuration. Returns list in REST API format'''
         interface_list = []
         for interface in config_dict["interfaces"]:
-            interface_config_request = {}
-            if "enabled" in interface:
-                interface_config_request["enabled"] = interface["enabled"]
-            if "sampling_rate" in interface:
-                interface_config_request["sampling-rate"] = interface["sampling_rate"]
+            interface_config_request = {rest_name: interface[name] for name, rest_name in self.interface_rest_fields if name in interface}
             if len(interface_config_request) == 0:
                 # listed interface doesn't actually have any configured settings, but name is hanging around
                 continue
@@ -413,10 +404,9 @@ class Sflow(ConfigBase):
         if "sampling_rate" in to_delete:
             requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/config/sampling-rate", "method": "DELETE"})
         if "collectors" in to_delete:
-            have_collectors_dict = {(collector["address"], collector["network_instance"], collector["port"]): collector for collector in have["collectors"]}
-            to_delete_collectors_dict = {(collector["address"], collector["network_instance"], collector["port"]): collector
-                                         for collector in to_delete["collectors"]}
-            if set(have_collectors_dict.keys()) == set(to_delete_collectors_dict.keys()):
+            have_collector_keys = {get_collector_key(collector) for collector in have["collectors"]}
+            to_delete_collector_keys = {get_collector_key(collector) for collector in to_delete["collectors"]}
+            if have_collector_keys == to_delete_collector_keys:
                 # if all the collectors match, is possible to delete all at once rather than go through the list deleting individually
                 requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/collectors", "method": "DELETE"})
             else:
@@ -434,20 +424,21 @@ class Sflow(ConfigBase):
         if interface or indivual attributes for interfaces
         should be deleted'''
         requests = []
+        have_interfaces_dict = {interface["name"]: interface for interface in have.get("interfaces", [])}
         for del_interface in to_delete["interfaces"]:
-            for interface in have.get("interfaces", []):
-                if del_interface["name"] == interface["name"]:
-                    if del_interface.keys() == {"name"} or set(del_interface.keys()) == set(interface.keys()):
-                        requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/interfaces/interface=" + interface["name"], "method": "DELETE"})
-                    else:
-                        if "enabled" in del_interface:
-                            requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/interfaces/interface=" + interface["name"] +
-                                             "/config/enabled", "method": "PATCH",
-                                             "data": {"openconfig-sampling-sflow:enabled": False}})
-                        if "sampling_rate" in del_interface:
-                            requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/interfaces/interface=" + interface["name"] +
-                                             "/config/sampling-rate", "method": "DELETE"})
-                    break
+            interface = have_interfaces_dict.get(del_interface["name"])
+            if interface is None:
+                continue
+            if del_interface.keys() == {"name"} or del_interface.keys() == interface.keys():
+                requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/interfaces/interface=" + interface["name"], "method": "DELETE"})
+            else:
+                if "enabled" in del_interface:
+                    requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/interfaces/interface=" + interface["name"] +
+                                     "/config/enabled", "method": "PATCH",
+                                     "data": {"openconfig-sampling-sflow:enabled": False}})
+                if "sampling_rate" in del_interface:
+                    requests.append({"path": "data/openconfig-sampling-sflow:sampling/sflow/interfaces/interface=" + interface["name"] +
+                                     "/config/sampling-rate", "method": "DELETE"})
         return requests
 
     def fill_defaults(self, config):
@@ -462,15 +453,9 @@ class Sflow(ConfigBase):
     def get_overridden_must_delete_config(self, remove_diff, introduced_diff):
         '''specifically for overridden and replaced states, finds and builds collection of which config settings need to be deleted and without anything that is
         getting replaced with new values. `get_diff` will return collection of both things that need to be deleted and things that will have new values.'''
-        result = {}
-        if "agent" in remove_diff and "agent" not in introduced_diff:
-            result["agent"] = remove_diff["agent"]
-        if "enabled" in remove_diff and "enabled" not in introduced_diff:
-            result["enabled"] = remove_diff["enabled"]
-        if "polling_interval" in remove_diff and "polling_interval" not in introduced_diff:
-            result["polling_interval"] = remove_diff["polling_interval"]
-        if "sampling_rate" in remove_diff and "sampling_rate" not in introduced_diff:
-            result["sampling_rate"] = remove_diff["sampling_rate"]
+        # global settings only need deleting if they aren't getting a new value
+        result = {name: remove_diff[name] for name, _rest_name in self.config_rest_fields
+                  if name in remove_diff and name not in introduced_diff}
         if "collectors" in remove_diff:
             result["collectors"] = remove_diff["collectors"]
         if "interfaces" in remove_diff:
@@ -481,24 +466,20 @@ class Sflow(ConfigBase):
                 # need to go through interfaces and ignore ones that don't need to be deleted
                 # only interfaces that are in have and not want or have settings that are in have and not want need to be deleted
                 result["interfaces"] = []
+                introduced_interfaces_dict = {interface_i['name']: interface_i for interface_i in introduced_diff['interfaces']}
                 for interface_r in remove_diff['interfaces']:
-                    match_interface = None
                     # find matching interface in introduced
-                    for interface_i in introduced_diff['interfaces']:
-                        if interface_r['name'] == interface_i['name']:
-                            match_interface = deepcopy(interface_r)
-
-                            for interface_setting in interface_r:
-                                if interface_setting != "name" and interface_setting in interface_i:
-                                    del match_interface[interface_setting]
-                            if len(match_interface) > 1:
-                                # if only name key left, everything else matches and will get substituted.
-                                # name left in becuase needed if there's any settings that do need deleting
-                                result["interfaces"].append(match_interface)
-                            break
-
-                    if match_interface is None:
+                    interface_i = introduced_interfaces_dict.get(interface_r['name'])
+                    if interface_i is None:
                         result["interfaces"].append(interface_r)
+                        continue
+                    # interface entries are flat, so keep only the settings not being substituted
+                    match_interface = {interface_setting: value for interface_setting, value in interface_r.items()
+                                       if interface_setting == "name" or interface_setting not in interface_i}
+                    if len(match_interface) > 1:
+                        # if only name key left, everything else matches and will get substituted.
+                        # name left in becuase needed if there's any settings that do need deleting
+                        result["interfaces"].append(match_interface)
         return result
 
 
@@ -507,16 +488,22 @@ def remove_none(config):
     enables using empty list/dict to specify clear everything for that section and differentiate this
     'clear everything' case from when no value was given
     remove_empties in ansible utils will remove empty lists and dicts as well as None'''
-    if isinstance(config, dict):
-        for k, v in list(config.items()):
-            if v is not None:
-                remove_none(v)
-            if v is None:
-                del config[k]
-    elif isinstance(config, list):
-        for item in list(config):
-            if item is not None:
-                remove_none(item)
-            if item is None:
-                config.remove(item)
+    to_visit = [config]
+    while to_visit:
+        node = to_visit.pop()
+        if isinstance(node, dict):
+            for k, v in list(node.items()):
+                if v is None:
+                    del node[k]
+                elif isinstance(v, (dict, list)):
+                    to_visit.append(v)
+        elif isinstance(node, list):
+            # rebuilding in place keeps this linear rather than calling remove() for each None
+            node[:] = [item for item in node if item is not None]
+            to_visit.extend(item for item in node if isinstance(item, (dict, list)))
     return config
+
+
+def get_collector_key(collector):
+    '''returns the tuple that uniquely identifies a collector, matching the collectors test keys'''
+    return (collector["address"], collector["network_instance"], collector["port"])
@@ -163,6 +163,13 @@ class TestSonicSflowModule(TestSonicModule):
         result = self.execute_module(changed=True)
         self.validate_config_requests()
 
+    def test_sonic_sflow_overridden_03_no_change(self):
+        test_name = "overridden_03_no_change"
+        set_module_args(self.fixture_data[test_name]['module_args'])
+        self.initialize_facts_get_requests(self.fixture_data[test_name]['existing_sflow_config'])
+        result = self.execute_module(changed=False)
+        self.validate_config_requests()
+
     def test_sonic_sflow_replaced_01_blank(self):
         test_name = "replaced_01_blank"
         set_module_args(self.fixture_data[test_name]['module_args'])